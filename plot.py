@@ -1,4 +1,5 @@
 import matplotlib.pyplot as plt
+import numpy as np
 #%matplotlib inline
 
 x = [1,2,3,4,5]
@@ -11,7 +12,10 @@ plt.ylabel("y-axis")
 
 #plt.plot(x, y, color='r', alpha=0.5, label='line plot')
 #plt.bar(x, y, color='b', alpha=0.5, label='bar plot')
-plt.hist(x, y, color='g', alpha=0.5, label='histogram plot')
+# plt.hist(x, y) treated y as (non-monotonic) bin edges; bin x once with
+# NumPy and draw the counts with a single bar call instead.
+counts, edges = np.histogram(x, bins=len(x))
+plt.bar(edges[:-1], counts, width=np.diff(edges), color='g', alpha=0.5, label='histogram plot', align='edge')
 
 
 plt.legend()
@@ -4,29 +4,29 @@ import streamlit as st
 import pandas as pd
 import sqlite3
 from datetime import datetime
-import plotly.express as px  # Optional: for richer charts
-import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+import threading
 
 # ----------------------------
 # Utility: Database setup
 # ----------------------------
 DB_PATH = "club_dashboard.db"
 
+@st.cache_resource(show_spinner=False)
 def init_db():
-    """Initialize SQLite DB with tables if they don't exist."""
+    """Initialize SQLite DB with tables if they don't exist (once per process)."""
     conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    # Announcements table
-    c.execute("""
+    conn.executescript("""
+    -- Announcements table
     CREATE TABLE IF NOT EXISTS announcements (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         title TEXT NOT NULL,
         content TEXT NOT NULL,
         date_created TEXT NOT NULL
-    )
-    """)
-    # Events table
-    c.execute("""
+    );
+    CREATE INDEX IF NOT EXISTS idx_ann_date ON announcements(date_created DESC);
+    -- Events table
     CREATE TABLE IF NOT EXISTS events (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         name TEXT NOT NULL,
@@ -35,81 +35,192 @@ def init_db():
         time TEXT,
         location TEXT,
         created_at TEXT NOT NULL
-    )
-    """)
-    # Members table
-    c.execute("""
+    );
+    CREATE INDEX IF NOT EXISTS idx_events_date ON events(date);
+    -- Members table
     CREATE TABLE IF NOT EXISTS members (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         name TEXT NOT NULL,
         role TEXT,
         joined_date TEXT
-    )
+    );
+    CREATE INDEX IF NOT EXISTS idx_members_joined ON members(joined_date DESC);
     """)
-    conn.commit()
     conn.close()
 
-def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
+@st.cache_resource
+def get_conn():
+    """Shared SQLite connection, opened once per process and reused across reruns."""
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    # Read hot pages through a memory map (256 MB cap) instead of read() calls
+    conn.execute("PRAGMA mmap_size=268435456")
     return conn
 
+@st.cache_resource
+def get_write_lock():
+    """Serializes writes on the shared connection across Streamlit sessions."""
+    return threading.Lock()
+
 # ----------------------------
 # Data Access Functions
 # ----------------------------
-def fetch_announcements():
-    conn = get_db_connection()
-    df = pd.read_sql_query("SELECT * FROM announcements ORDER BY date_created DESC", conn)
-    conn.close()
-    return df
+# Streamlit reruns the whole script on every interaction, so reads are cached
+# for a short TTL and explicitly cleared after each insert.
+CACHE_TTL = 60
+
+# Single-row inserts keep the SQL text identical so SQLite's statement cache
+# on the shared connection reuses one prepared statement; bulk inserts share it.
+INSERT_ANNOUNCEMENT_SQL = "INSERT INTO announcements (title, content, date_created) VALUES (?, ?, ?)"
+INSERT_EVENT_SQL = "INSERT INTO events (name, description, date, time, location, created_at) VALUES (?, ?, ?, ?, ?, ?)"
+INSERT_MEMBER_SQL = "INSERT INTO members (name, role, joined_date) VALUES (?, ?, ?)"
+
+def _insert_many(sql, rows):
+    """Insert all rows inside one transaction on a dedicated connection.
+
+    Keeping the transaction off the shared connection means WAL isolation
+    hides uncommitted rows from readers; `with conn` commits on success and
+    rolls back on any exception.
+    """
+    with get_write_lock():
+        with closing(sqlite3.connect(DB_PATH)) as conn, conn:
+            conn.executemany(sql, rows)
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def fetch_announcements_rows(limit=200):
+    """Latest announcements as plain (title, content, date_created) tuples.
+
+    The list page only iterates rows, so this skips building a DataFrame.
+    """
+    return get_conn().execute(
+        "SELECT title, content, date_created FROM announcements ORDER BY date_created DESC LIMIT ?",
+        (limit,)
+    ).fetchall()
+
+def _clear_announcement_caches():
+    fetch_announcements_rows.clear()
+    fetch_announcement_counts_by_day.clear()
 
 def add_announcement(title, content):
-    conn = get_db_connection()
-    c = conn.cursor()
     now = datetime.now().isoformat()
-    c.execute(
-        "INSERT INTO announcements (title, content, date_created) VALUES (?, ?, ?)",
-        (title, content, now)
+    with get_write_lock():
+        get_conn().execute(INSERT_ANNOUNCEMENT_SQL, (title, content, now))
+    _clear_announcement_caches()
+
+def bulk_add_announcements(rows):
+    """Insert many (title, content) pairs in a single transaction."""
+    now = datetime.now().isoformat()
+    _insert_many(INSERT_ANNOUNCEMENT_SQL, [(title, content, now) for title, content in rows])
+    _clear_announcement_caches()
+
+# List views only need these columns
+EVENT_LIST_COLUMNS = "id, name, date, time, location"
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def fetch_events_split(today, limit=100):
+    """Return (upcoming, past) events relative to `today`, filtered in SQL.
+
+    'date' is read straight into datetime64 instead of being converted afterwards.
+    """
+    conn = get_conn()
+    upcoming = pd.read_sql_query(
+        f"SELECT {EVENT_LIST_COLUMNS} FROM events WHERE date >= ? ORDER BY date ASC LIMIT ?",
+        conn, params=(today.isoformat(), limit), parse_dates=['date']
     )
-    conn.commit()
-    conn.close()
+    past = pd.read_sql_query(
+        f"SELECT {EVENT_LIST_COLUMNS} FROM events WHERE date < ? ORDER BY date DESC LIMIT ?",
+        conn, params=(today.isoformat(), limit), parse_dates=['date']
+    )
+    return upcoming, past
 
-def fetch_events():
-    conn = get_db_connection()
-    df = pd.read_sql_query("SELECT * FROM events ORDER BY date ASC", conn)
-    conn.close()
-    # Convert date column to datetime if needed:
-    if not df.empty:
-        df['date'] = pd.to_datetime(df['date'])
-    return df
+def _clear_event_caches():
+    fetch_events_split.clear()
+    _events_view.clear()
+    fetch_event_counts_by_month.clear()
 
 def add_event(name, description, date, time, location):
-    conn = get_db_connection()
-    c = conn.cursor()
     now = datetime.now().isoformat()
-    c.execute(
-        "INSERT INTO events (name, description, date, time, location, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+    with get_write_lock():
+        get_conn().execute(INSERT_EVENT_SQL, (name, description, date.isoformat(), time, location, now))
+    _clear_event_caches()
+
+def bulk_add_events(rows):
+    """Insert many (name, description, date, time, location) rows in a single transaction."""
+    now = datetime.now().isoformat()
+    _insert_many(INSERT_EVENT_SQL, [
         (name, description, date.isoformat(), time, location, now)
-    )
-    conn.commit()
-    conn.close()
+        for name, description, date, time, location in rows
+    ])
+    _clear_event_caches()
 
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
 def fetch_members():
-    conn = get_db_connection()
-    df = pd.read_sql_query("SELECT * FROM members ORDER BY joined_date DESC", conn)
-    conn.close()
-    if not df.empty:
-        df['joined_date'] = pd.to_datetime(df['joined_date'])
+    df = pd.read_sql_query(
+        "SELECT id, name, role, joined_date FROM members ORDER BY joined_date DESC", get_conn(), parse_dates=['joined_date']
+    )
     return df
 
+def _clear_member_caches():
+    fetch_members.clear()
+    _members_view.clear()
+    fetch_role_counts.clear()
+
+def _member_row(name, role, joined_date):
+    return (name, role, joined_date.isoformat() if hasattr(joined_date, "isoformat") else joined_date)
+
 def add_member(name, role, joined_date):
-    conn = get_db_connection()
-    c = conn.cursor()
-    c.execute(
-        "INSERT INTO members (name, role, joined_date) VALUES (?, ?, ?)",
-        (name, role, joined_date.isoformat() if hasattr(joined_date, "isoformat") else joined_date)
+    with get_write_lock():
+        get_conn().execute(INSERT_MEMBER_SQL, _member_row(name, role, joined_date))
+    _clear_member_caches()
+
+def bulk_add_members(rows):
+    """Insert many (name, role, joined_date) rows in a single transaction."""
+    _insert_many(INSERT_MEMBER_SQL, [_member_row(*row) for row in rows])
+    _clear_member_caches()
+
+# ----------------------------
+# Analytics Aggregates
+# ----------------------------
+# Grouping is done by SQLite so only the summary rows reach pandas. The
+# Analytics page runs these concurrently on get_executor(); each query opens its own
+# short-lived connection, since WAL lets readers proceed in parallel while the
+# shared connection would serialize them.
+@st.cache_resource
+def get_executor():
+    """Thread pool for the analytics queries, created once per process.
+
+    A module-level pool would be rebuilt (and leaked) on every script rerun.
+    """
+    return ThreadPoolExecutor(max_workers=3)
+
+def _read_aggregate(sql):
+    # Arrow-backed columns avoid one Python object per value (needs pandas>=2.0 + pyarrow)
+    with closing(sqlite3.connect(DB_PATH)) as conn:
+        return pd.read_sql_query(sql, conn, dtype_backend="pyarrow")
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def fetch_announcement_counts_by_day():
+    return _read_aggregate(
+        "SELECT date(date_created) AS date, COUNT(*) AS count FROM announcements GROUP BY date ORDER BY date"
+    )
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def fetch_event_counts_by_month():
+    return _read_aggregate(
+        "SELECT strftime('%Y-%m', date) AS month, COUNT(*) AS num_events FROM events GROUP BY month ORDER BY month"
+    )
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def fetch_role_counts():
+    return _read_aggregate(
+        # Blank and NULL roles are grouped together; GROUP BY 1 targets the
+        # expression, since a bare "role" would resolve to the raw column.
+        "SELECT COALESCE(NULLIF(role, ''), '(none)') AS role, COUNT(*) AS count "
+        "FROM members GROUP BY 1 ORDER BY count DESC"
     )
-    conn.commit()
-    conn.close()
 
 # ----------------------------
 # Page: Home
@@ -140,15 +251,15 @@ def page_home():
 # ----------------------------
 def page_announcements():
     st.header("Announcements")
-    df = fetch_announcements()
+    rows = fetch_announcements_rows()
 
     # Display existing announcements
-    if df.empty:
+    if not rows:
         st.info("No announcements yet.")
     else:
-        for _, row in df.iterrows():
-            with st.expander(f"{row['title']}  ({row['date_created'][:10]})"):
-                st.markdown(row['content'])
+        for title, content, date_created in rows:
+            with st.expander(f"{title}  ({date_created[:10]})"):
+                st.markdown(content)
 
     st.markdown("---")
     st.subheader("Create New Announcement")
@@ -163,31 +274,40 @@ def page_announcements():
                 add_announcement(title.strip(), content.strip())
                 st.success("Announcement posted!")
                 # Rerun to show the new announcement
-                st.experimental_rerun()
+                st.rerun()
 
 # ----------------------------
 # Page: Events
 # ----------------------------
+EVENT_TABLE_COLUMNS = ['name', 'date', 'time', 'location']
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _events_view(which, today):
+    """Displayed columns of the "upcoming" or "past" events table."""
+    upcoming, past = fetch_events_split(today)
+    df = upcoming if which == "upcoming" else past
+    return df[EVENT_TABLE_COLUMNS]
+
 def page_events():
     st.header("Events")
-    df = fetch_events()
-
-    # Filter upcoming vs past
-    if not df.empty:
-        today = pd.to_datetime(datetime.now().date())
-        upcoming = df[df['date'] >= today]
-        past = df[df['date'] < today]
+    # Resolve "today" once per run so both partitions use the same cutoff;
+    # as a plain date it also keys the cached split for the whole day.
+    today = datetime.now().date()
+    # Upcoming vs past are split by SQL
+    upcoming = _events_view("upcoming", today)
+    past = _events_view("past", today)
+    if not (upcoming.empty and past.empty):
         st.subheader("Upcoming Events")
         if upcoming.empty:
             st.write("No upcoming events.")
         else:
             # Show as table or cards
-            st.dataframe(upcoming[['name', 'date', 'time', 'location']])
+            st.dataframe(upcoming)
         st.subheader("Past Events")
         if past.empty:
             st.write("No past events.")
         else:
-            st.dataframe(past[['name', 'date', 'time', 'location']])
+            st.dataframe(past)
     else:
         st.info("No events scheduled yet.")
 
@@ -206,18 +326,23 @@ def page_events():
             else:
                 add_event(name.strip(), description.strip(), date, time.strftime("%H:%M") if hasattr(time, "strftime") else str(time), location.strip())
                 st.success("Event added!")
-                st.experimental_rerun()
+                st.rerun()
 
 # ----------------------------
 # Page: Members
 # ----------------------------
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _members_view():
+    """Displayed columns of the members table."""
+    return fetch_members()[['name', 'role', 'joined_date']]
+
 def page_members():
     st.header("Members")
-    df = fetch_members()
+    df = _members_view()
     if df.empty:
         st.info("No members in the database yet.")
     else:
-        st.dataframe(df[['name', 'role', 'joined_date']])
+        st.dataframe(df)
 
     st.markdown("---")
     st.subheader("Add New Member")
@@ -232,11 +357,32 @@ def page_members():
             else:
                 add_member(name.strip(), role.strip(), joined_date)
                 st.success("Member added!")
-                st.experimental_rerun()
+                st.rerun()
 
 # ----------------------------
 # Page: Analytics
 # ----------------------------
+# Figures are cached on the aggregate frame's contents, so they are only
+# rebuilt when the underlying counts change. Only the latest frame is looked
+# up again, so a few entries per chart are kept. plotly.express is imported
+# lazily here so other pages don't pay its import cost at startup.
+FIG_CACHE_ENTRIES = 4
+
+@st.cache_data(max_entries=FIG_CACHE_ENTRIES, show_spinner=False)
+def _announcements_fig(count_by_date):
+    import plotly.express as px
+    return px.bar(count_by_date, x='date', y='count', title="Announcements per Day")
+
+@st.cache_data(max_entries=FIG_CACHE_ENTRIES, show_spinner=False)
+def _events_fig(count_ev):
+    import plotly.express as px
+    return px.line(count_ev, x='month', y='num_events', title="Events per Month")
+
+@st.cache_data(max_entries=FIG_CACHE_ENTRIES, show_spinner=False)
+def _roles_fig(role_counts):
+    import plotly.express as px
+    return px.pie(role_counts, names='role', values='count', title="Roles Breakdown")
+
 def page_analytics():
     st.header("Analytics & Insights")
     st.markdown(
@@ -244,37 +390,33 @@ def page_analytics():
         Traditional dashboards would show counts, trends over time, etc. Here are some examples:
         """
     )
+    # Run the three aggregate queries concurrently
+    futures = [
+        get_executor().submit(fetch)
+        for fetch in (fetch_announcement_counts_by_day, fetch_event_counts_by_month, fetch_role_counts)
+    ]
+    count_by_date, count_ev, role_counts = (future.result() for future in futures)
+
     # Announcements over time
-    ann = fetch_announcements()
-    if not ann.empty:
-        df_ann = ann.copy()
-        df_ann['date'] = pd.to_datetime(df_ann['date_created']).dt.date
-        count_by_date = df_ann.groupby('date').size().reset_index(name='count')
+    if not count_by_date.empty:
         st.subheader("Announcements Posted Over Time")
-        fig1 = px.bar(count_by_date, x='date', y='count', title="Announcements per Day")
+        fig1 = _announcements_fig(count_by_date)
         st.plotly_chart(fig1, use_container_width=True)
     else:
         st.write("No announcements data for analytics.")
 
     # Events count by month
-    ev = fetch_events()
-    if not ev.empty:
-        df_ev = ev.copy()
-        df_ev['month'] = df_ev['date'].dt.to_period("M").astype(str)
-        count_ev = df_ev.groupby('month').size().reset_index(name='num_events')
+    if not count_ev.empty:
         st.subheader("Events Scheduled by Month")
-        fig2 = px.line(count_ev, x='month', y='num_events', title="Events per Month")
+        fig2 = _events_fig(count_ev)
         st.plotly_chart(fig2, use_container_width=True)
     else:
         st.write("No events data for analytics.")
 
     # Member roles distribution
-    mem = fetch_members()
-    if not mem.empty:
+    if not role_counts.empty:
         st.subheader("Member Roles Distribution")
-        role_counts = mem['role'].value_counts().reset_index()
-        role_counts.columns = ['role', 'count']
-        fig3 = px.pie(role_counts, names='role', values='count', title="Roles Breakdown")
+        fig3 = _roles_fig(role_counts)
         st.plotly_chart(fig3, use_container_width=True)
     else:
         st.write("No member data for analytics.")
@@ -283,9 +425,8 @@ def page_analytics():
 # Main
 # ----------------------------
 def main():
-    # Initialize DB on first run
-    if not os.path.exists(DB_PATH):
-        init_db()
+    # Initialize DB schema (cached, so this runs once per process)
+    init_db()
 
     st.set_page_config(page_title="Club Dashboard", layout="wide")
     st.sidebar.title("Navigation")